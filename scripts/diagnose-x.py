@@ -4,11 +4,20 @@
 """
 
 import asyncio
+import sys
 from playwright.async_api import async_playwright
 from pathlib import Path
 
+from x_browser import wait_for_articles
+
 profile_path = Path.home() / "Library/Application Support/Google/Chrome/Default"
 
+# --no-sandbox / --disable-dev-shm-usage 只是 Linux 容器里的变通，macOS 上不需要；
+# 不再传 --disable-gpu，避免 headless 合成回退到更慢的软件路径
+launch_args = ["--disable-blink-features=AutomationControlled"]
+if sys.platform == "linux":
+    launch_args += ["--no-sandbox", "--disable-dev-shm-usage"]
+
 async def diagnose():
     print("启动诊断...")
     
@@ -16,12 +25,7 @@ async def diagnose():
         browser = await p.chromium.launch_persistent_context(
             str(profile_path),
             headless=True,
-            args=[
-                "--disable-gpu",
-                "--no-sandbox",
-                "--disable-dev-shm-usage",
-                "--disable-blink-features=AutomationControlled",
-            ],
+            args=launch_args,
             viewport={"width": 1920, "height": 1080},
             user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
         )
@@ -33,12 +37,12 @@ async def diagnose():
             await page.goto("https://x.com/home", wait_until="domcontentloaded", timeout=90000)
             print("✅ 页面加载成功")
             
-            # 等待
-            await asyncio.sleep(5)
+            # 等待帖子渲染
+            await wait_for_articles(page)
             
-            # 截图
-            screenshot_path = "/Users/clark/clawd/scripts/diagnose_screenshot.png"
-            await page.screenshot(path=screenshot_path, full_page=True)
+            # 截图（只截当前视口，JPEG 压缩，避免无限滚动页面生成超大位图）
+            screenshot_path = "/Users/clark/clawd/scripts/diagnose_screenshot.jpg"
+            await page.screenshot(path=screenshot_path, full_page=False, type="jpeg", quality=60)
             print(f"✅ 截图已保存：{screenshot_path}")
             
             # 检查页面结构
@@ -56,15 +60,25 @@ async def diagnose():
                 "[class*='Post']",
             ]
             
+            # 一次 evaluate 统计所有选择器的匹配数量
+            counts = await page.evaluate("""
+                (sels) => Object.fromEntries(sels.map(s => {
+                    try {
+                        return [s, document.querySelectorAll(s).length];
+                    } catch (e) {
+                        return [s, String(e)];
+                    }
+                }))
+            """, selectors)
+            
             for selector in selectors:
-                try:
-                    elements = await page.query_selector_all(selector)
-                    if elements:
-                        print(f"  ✅ 找到 {len(elements)} 个元素匹配 '{selector}'")
-                    else:
-                        print(f"  ❌ 未找到元素 '{selector}'")
-                except Exception as e:
-                    print(f"  ⚠️ 检查 '{selector}' 时出错: {e}")
+                count = counts.get(selector)
+                if isinstance(count, str):
+                    print(f"  ⚠️ 检查 '{selector}' 时出错: {count}")
+                elif count:
+                    print(f"  ✅ 找到 {count} 个元素匹配 '{selector}'")
+                else:
+                    print(f"  ❌ 未找到元素 '{selector}'")
             
             # 获取页面 HTML 的一部分用于分析
             html_preview = await page.evaluate("() => document.body.innerHTML.substring(0, 5000)")
@@ -3,125 +3,72 @@
 通过浏览器工具抓取 X.com 帖子
 """
 
+import asyncio
 import json
-import subprocess
 from datetime import datetime
 
-def run_browser_command(cmd):
+from x_extract import EXTRACT_POSTS_JS
+
+async def run_browser_command(cmd, timeout=30):
     """运行 openclaw browser 命令"""
+    proc = None
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=30
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
         )
-        if result.returncode == 0:
-            return result.stdout
+        stdout, _ = await asyncio.wait_for(proc.communicate(), timeout)
+        if proc.returncode == 0:
+            return stdout.decode("utf-8", errors="replace")
+        return None
+    except asyncio.TimeoutError:
+        print(f"错误: 命令超时 ({timeout}s)")
+        proc.kill()
+        await proc.wait()  # 回收子进程，避免事件循环关闭后遗留僵尸进程和传输警告
         return None
     except Exception as e:
         print(f"错误: {e}")
         return None
 
-def fetch_posts(count=20):
+async def fetch_posts(count=20):
     """获取帖子"""
     posts = []
 
     # 先导航到 x.com
     print("导航到 x.com...")
-    run_browser_command([
+    await run_browser_command([
         "openclaw", "browser", "navigate",
         "--profile", "chrome",
         "--targetUrl", "https://x.com/home"
     ])
 
-    # 获取帖子数量
-    article_count = 6  # 默认值
-    print("检查帖子数量...")
-    result = run_browser_command([
+    # 一次性提取所有帖子的信息（maxText: null，JSON 输出保留完整正文）
+    print("提取帖子...")
+    result = await run_browser_command([
         "openclaw", "browser", "act",
         "--profile", "chrome",
-        "--request", json.dumps({"kind": "evaluate", "fn": "document.querySelectorAll('article').length"})
+        "--request", json.dumps({"kind": "evaluate", "fn": f"({EXTRACT_POSTS_JS})({{limit: {count}, maxText: null}})"})
     ])
 
-    if result:
-        try:
-            data = json.loads(result)
-            article_count = int(data.get("result", 6))
-            print(f"找到 {article_count} 个帖子")
-        except:
-            article_count = 6
-            print(f"默认读取 {article_count} 个帖子")
-
-    # 提取每个帖子的信息
-    for i in range(min(article_count, count)):
-        try:
-            # 获取文本内容
-            text_result = run_browser_command([
-                "openclaw", "browser", "act",
-                "--profile", "chrome",
-                "--request", json.dumps({
-                    "kind": "evaluate",
-                    "fn": f"document.querySelectorAll('article')[{i}].querySelector('[data-testid=\"tweetText\"]')?.textContent || ''"
-                })
-            ])
-
-            # 获取作者
-            author_result = run_browser_command([
-                "openclaw", "browser", "act",
-                "--profile", "chrome",
-                "--request", json.dumps({
-                    "kind": "evaluate",
-                    "fn": f"document.querySelectorAll('article')[{i}].querySelector('header a')?.textContent || 'Unknown'"
-                })
-            ])
-
-            # 获取时间
-            time_result = run_browser_command([
-                "openclaw", "browser", "act",
-                "--profile", "chrome",
-                "--request", json.dumps({
-                    "kind": "evaluate",
-                    "fn": f"document.querySelectorAll('article')[{i}].querySelector('time')?.getAttribute('datetime') || ''"
-                })
-            ])
-
-            text = ""
-            if text_result:
-                try:
-                    data = json.loads(text_result)
-                    text = data.get("result", "")
-                except:
-                    pass
-
-            author = "Unknown"
-            if author_result:
-                try:
-                    data = json.loads(author_result)
-                    author = data.get("result", "Unknown")
-                except:
-                    pass
-
-            time_str = ""
-            if time_result:
-                try:
-                    data = json.loads(time_result)
-                    time_str = data.get("result", "")
-                except:
-                    pass
-
-            if text:
-                posts.append({
-                    "author": author.strip(),
-                    "text": text.strip(),
-                    "time": time_str,
-                    "index": i + 1
-                })
-                print(f"✓ 获取第 {i+1} 条帖子: {author[:30]}")
-
-        except Exception as e:
-            print(f"获取第 {i+1} 条帖子时出错: {e}")
-            continue
+    if not result:
+        return posts
+
+    try:
+        items = json.loads(result).get("result") or []
+        # 结果可能被再序列化一次
+        if isinstance(items, str):
+            items = json.loads(items)
+    except Exception as e:
+        print(f"解析帖子数据时出错: {e}")
+        return posts
+
+    print(f"找到 {len(items)} 个帖子")
+
+    for i, item in enumerate(items, 1):
+        item["index"] = i
+        posts.append(item)
+        print(f"✓ 获取第 {i} 条帖子: {item['author'][:30]}")
 
     return posts
 
@@ -130,7 +77,7 @@ def main():
     print("X.com 帖子抓取")
     print(f"{'='*60}\n")
 
-    posts = fetch_posts(20)
+    posts = asyncio.run(fetch_posts(20))
 
     print(f"\n{'='*60}")
     print(f"✅ 成功获取 {len(posts)} 个帖子")
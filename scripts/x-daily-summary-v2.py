@@ -5,11 +5,11 @@ X.com (Twitter) 每日帖子综述脚本
 每天早上 6 点执行
 """
 
-import json
 import sys
 import asyncio
 from datetime import datetime
-from pathlib import Path
+
+from x_extract import save_posts_async
 
 async def fetch_posts_with_browser():
     """
@@ -28,25 +28,6 @@ async def fetch_posts_with_browser():
     
     return []
 
-def save_posts_to_file(posts):
-    """保存帖子到文件"""
-    summary_file = Path("/Users/clark/clawd/scripts/x-summary-today.md")
-    
-    content = f"# X.com 每日综述\n\n"
-    content += f"📅 时间：{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-    content += f"📊 共获取 {len(posts)} 条帖子\n\n"
-    content += "---\n\n"
-    
-    for i, post in enumerate(posts, 1):
-        content += f"### {i}. {post['author']}\n\n"
-        content += f"{post['text']}\n\n"
-        if post.get('url'):
-            content += f"[查看原文]({post['url']})\n\n"
-        content += f"---\n\n"
-    
-    summary_file.write_text(content)
-    return summary_file
-
 async def main():
     """
     主函数：获取帖子并保存
@@ -65,7 +46,7 @@ async def main():
         print("="*60 + "\n")
         
         posts = await fetch_posts_with_browser()
-        summary_file = save_posts_to_file(posts)
+        summary_file = await save_posts_async(posts)
         
         print(f"✅ 综述文件已保存到：{summary_file}")
         
@@ -1,10 +1,22 @@
 #!/bin/bash
 # X.com 每日综述脚本
 # 每天早上 6 点执行
+#
+# 可选：常驻守护进程，复用与 Chrome 的 CDP 连接，省去每次启动 Playwright 的开销
+#   cd /Users/clark/clawd/scripts && source venv/bin/activate
+#   nohup python3 x-summary-daemon.py >> ~/code/x-summary-daemon.log 2>&1 &
+# 守护进程未运行时 x-daily-summary-browser.py 自动回退到直连 CDP
+#
+# 可选：复用浏览器登录态直连 HomeTimeline GraphQL 接口，跳过页面渲染（需要 pip install requests）
+#   在下方取消注释 X_HOME_TIMELINE_QUERY_ID 并填写（cron 不会继承交互 shell 的环境变量）
+# queryId 可在已登录的 x.com 开发者工具 Network 面板中找到（请求 /i/api/graphql/<queryId>/HomeTimeline），
+# 随 X 前端发布而变化；同一请求的 authorization 头即 x_extract.py 中的 X_WEB_BEARER。
+# 未设置时直接渲染页面提取帖子
 
 SCRIPT_DIR="/Users/clark/clawd/scripts"
 LOG_FILE="$HOME/code/x-summary.log"
 SUMMARY_FILE="$SCRIPT_DIR/x-summary-today.md"
+# export X_HOME_TIMELINE_QUERY_ID="<queryId>"
 
 mkdir -p "$(dirname "$LOG_FILE")"
 
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+X.com 帖子抓取守护进程
+常驻运行并保持与调试 Chrome 的 CDP 连接，cron 执行的 x-daily-summary.py
+通过 Unix socket 发送 fetch 请求，省去每次启动 Python、Playwright 和连接浏览器的开销
+
+启动：nohup python3 x-summary-daemon.py >> ~/code/x-summary-daemon.log 2>&1 &
+x-daily-summary.py 与 x-daily-summary-browser.py 会先尝试守护进程，未运行时自动回退到直连 CDP
+
+协议：客户端发送一行 JSON {"cmd": "fetch", "limit": 20, "scrolls": 3}，
+守护进程返回 {"ok": true, "posts": [...]} 或 {"ok": false, "error": "..."} 后关闭连接
+"""
+
+import sys
+import asyncio
+import json
+import os
+from datetime import datetime
+
+from playwright.async_api import async_playwright
+
+from x_browser import DEBUG_PORT, start_remote_debugging
+from x_extract import DAEMON_SOCKET, fetch_posts_from_browser
+
+async def serve(port=DEBUG_PORT, socket_path=DAEMON_SOCKET):
+    """
+    启动守护进程并一直运行
+    """
+    async with async_playwright() as p:
+        browser = None
+        # 同一时间只允许一个抓取任务操作浏览器
+        fetch_lock = asyncio.Lock()
+
+        async def get_browser():
+            nonlocal browser
+            if browser is None or not browser.is_connected():
+                # start_remote_debugging 会阻塞（等待 Chrome 启动最多数十秒），放到线程中执行，避免期间无法响应其他连接
+                if not await asyncio.to_thread(start_remote_debugging, port):
+                    raise RuntimeError("无法启动 Chrome 远程调试")
+                browser = await p.chromium.connect_over_cdp(f"http://localhost:{port}")
+                print(f"{datetime.now()} - 已连接到 Chrome 远程调试端口 {port}")
+            return browser
+
+        async def handle(reader, writer):
+            try:
+                request = json.loads(await reader.readline() or b"{}")
+                if request.get("cmd") != "fetch":
+                    response = {"ok": False, "error": f"unknown command: {request.get('cmd')}"}
+                else:
+                    async with fetch_lock:
+                        posts = await fetch_posts_from_browser(
+                            await get_browser(),
+                            request.get("limit", 20),
+                            request.get("scrolls", 3)
+                        )
+                    response = {"ok": True, "posts": posts}
+            except Exception as e:
+                print(f"{datetime.now()} - 错误：{e}")
+                response = {"ok": False, "error": str(e)}
+
+            writer.write(json.dumps(response, ensure_ascii=False).encode("utf-8"))
+            await writer.drain()
+            writer.close()
+            await writer.wait_closed()
+
+        # 清理上次异常退出遗留的 socket 文件
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+        server = await asyncio.start_unix_server(handle, path=socket_path)
+        print(f"{datetime.now()} - 守护进程已启动，监听 {socket_path}")
+
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    sys.exit(0)
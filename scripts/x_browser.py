@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Chrome 远程调试（CDP）辅助函数
+供各个 X.com 综述脚本复用同一个常驻 Chrome，避免每次冷启动浏览器
+"""
+
+from datetime import datetime
+from pathlib import Path
+import http.client
+import subprocess
+import time
+
+DEBUG_PORT = 9222
+
+def is_debugger_ready(port, host="127.0.0.1", timeout=0.2):
+    """
+    检查 Chrome 调试端口是否可用（请求 CDP 的 /json/version，不启动子进程）
+    """
+    conn = http.client.HTTPConnection(host, port, timeout=timeout)
+    try:
+        conn.request("GET", "/json/version")
+        return conn.getresponse().status == 200
+    except (OSError, http.client.HTTPException):
+        return False
+    finally:
+        conn.close()
+
+def start_remote_debugging(debug_port=DEBUG_PORT):
+    """
+    启动 Chrome 远程调试模式
+    """
+    chrome_path = "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"
+    user_data_dir = Path.home() / "Library/Application Support/Google/Chrome"
+    
+    # 检查调试端口上是否已有 Chrome 在响应
+    if is_debugger_ready(debug_port):
+        print(f"{datetime.now()} - 调试端口 {debug_port} 已在使用")
+        return True
+    
+    print(f"{datetime.now()} - 启动 Chrome 远程调试...")
+    
+    # 启动 Chrome 远程调试模式
+    cmd = [
+        chrome_path,
+        f"--remote-debugging-port={debug_port}",
+        f"--user-data-dir={user_data_dir}",
+        "--new-window",
+    ]
+    
+    # 后台启动
+    proc = subprocess.Popen(cmd)
+    
+    # 等待 Chrome 启动（每 100ms 探测一次端口）
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if is_debugger_ready(debug_port):
+            print(f"{datetime.now()} - Chrome 远程调试已启动")
+            return True
+        time.sleep(0.1)
+    
+    print(f"{datetime.now()} - 警告：Chrome 启动超时")
+    return False
+
+async def wait_for_articles(page, min_count=10, timeout=15000):
+    """
+    等待页面渲染出至少 min_count 个帖子（超时返回 False，不抛异常）
+    """
+    try:
+        await page.wait_for_function(
+            "(n) => document.querySelectorAll('article').length >= n",
+            arg=min_count,
+            timeout=timeout
+        )
+        return True
+    except Exception:
+        return False
+
+# 在页面内完成多次滚动，每次滚动后轮询等待新帖子渲染（最多 timeoutMs）
+AUTO_SCROLL_JS = """
+async ([times, timeoutMs]) => {
+    const count = () => document.querySelectorAll('article').length;
+    for (let i = 0; i < times; i++) {
+        const prev = count();
+        window.scrollBy(0, document.body.scrollHeight);
+        const deadline = Date.now() + timeoutMs;
+        while (count() <= prev && Date.now() < deadline) {
+            await new Promise(r => setTimeout(r, 100));
+        }
+    }
+}
+"""
+
+async def auto_scroll(page, times=4, timeout=3000):
+    """
+    在浏览器内连续滚动 times 次（单次 CDP 往返）
+    """
+    await page.evaluate(AUTO_SCROLL_JS, [times, timeout])
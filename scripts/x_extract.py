@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+X.com 帖子提取公共模块
+各综述脚本共用的帖子提取 JS、抓取流程和 Markdown 保存
+"""
+
+from datetime import datetime
+from pathlib import Path
+import asyncio
+import json
+import os
+
+try:
+    from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+    HAS_PLAYWRIGHT = True
+except ImportError:
+    HAS_PLAYWRIGHT = False
+
+try:
+    import requests
+    HAS_REQUESTS = True
+except ImportError:
+    HAS_REQUESTS = False
+
+from x_browser import DEBUG_PORT, start_remote_debugging, wait_for_articles, auto_scroll
+
+SUMMARY_FILE = Path("/Users/clark/clawd/scripts/x-summary-today.md")
+
+# x-summary-daemon.py 监听的 Unix socket
+DAEMON_SOCKET = "/tmp/x-summary.sock"
+# 等待守护进程回复的上限（秒），超时后回退到直连 CDP
+DAEMON_TIMEOUT = 120
+
+# 导航超时（毫秒）和重试次数：快速失败后重试，避免一次卡住拖住整个 cron 任务
+GOTO_TIMEOUT = 10000
+GOTO_ATTEMPTS = 3
+
+# 提取时用不到的资源类型，在网络层直接拦截以减少下载和渲染
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+
+# X 网页端公开使用的 Bearer Token（配合登录 Cookie 访问 GraphQL 接口）
+# 取自 x.com 前端脚本，X 更换后需同步更新（见 x-daily-summary.sh 中的说明）
+X_WEB_BEARER = (
+    "AAAAAAAAAAAAAAAAAAAAANRILgAAAAAAnNwIzUejRCOuH5E6I8xnZz4puTs"
+    "%3D1Zv7ttfk8LF81IUq16cHjhLTvJu4FA33AGWWjCpTnA"
+)
+
+# HomeTimeline 的 queryId 随 X 前端发布而变化，通过环境变量 X_HOME_TIMELINE_QUERY_ID 配置；
+# 未配置时跳过 API 直连，直接渲染页面提取
+HOME_TIMELINE_QUERY_ID = os.environ.get("X_HOME_TIMELINE_QUERY_ID", "")
+
+HOME_TIMELINE_FEATURES = {
+    "responsive_web_graphql_exclude_directive_enabled": True,
+    "verified_phone_label_enabled": False,
+    "creator_subscriptions_tweet_preview_api_enabled": True,
+    "responsive_web_graphql_timeline_navigation_enabled": True,
+    "responsive_web_graphql_skip_user_profile_image_extensions_enabled": False,
+    "tweetypie_unmention_optimization_enabled": True,
+    "responsive_web_edit_tweet_api_enabled": True,
+    "graphql_is_translatable_rweb_tweet_is_translatable_enabled": True,
+    "view_counts_everywhere_api_enabled": True,
+    "longform_notetweets_consumption_enabled": True,
+    "responsive_web_twitter_article_tweet_consumption_enabled": True,
+    "tweet_awards_web_tipping_enabled": False,
+    "freedom_of_speech_not_reach_fetch_enabled": True,
+    "standardized_nudges_misinfo": True,
+    "tweet_with_visibility_results_prefer_gql_limited_actions_policy_enabled": True,
+    "longform_notetweets_rich_text_read_enabled": True,
+    "longform_notetweets_inline_media_enabled": True,
+    "responsive_web_enhance_cards_enabled": False,
+}
+
+# 提取帖子的 JS（参数 {limit, maxText}：最多返回的帖子数、正文截断长度，maxText 为 null 时保留全文）
+EXTRACT_POSTS_JS = """
+({limit, maxText}) => {
+    const posts = [];
+    for (const article of document.querySelectorAll('article')) {
+        if (posts.length >= limit) break;
+
+        const textEl = article.querySelector('[data-testid="tweetText"]');
+        const text = textEl ? textEl.textContent.trim() : '';
+        if (!text) continue;
+
+        const authorEl = article.querySelector('header a');
+        const timeEl = article.querySelector('time');
+        const linkEl = article.querySelector('a[href*="/status/"]');
+
+        posts.push({
+            author: authorEl ? authorEl.textContent.trim() : 'Unknown',
+            text: maxText == null ? text : text.substring(0, maxText),
+            time: timeEl ? timeEl.getAttribute('datetime') : '',
+            url: linkEl ? linkEl.href : ''
+        });
+    }
+    return posts;
+}
+"""
+
+async def extract_posts(page, limit=20, max_text=500):
+    """
+    从当前页面提取最多 limit 个帖子，正文截断到 max_text 个字符（None 表示不截断）
+    """
+    return await page.evaluate(EXTRACT_POSTS_JS, {"limit": limit, "maxText": max_text})
+
+def _parse_timeline(instructions, limit):
+    """
+    从 HomeTimeline 的 instructions 中解析出帖子（字段与 EXTRACT_POSTS_JS 一致）
+    """
+    posts = []
+    for instruction in instructions:
+        for entry in instruction.get("entries", []):
+            result = (entry.get("content", {})
+                      .get("itemContent", {})
+                      .get("tweet_results", {})
+                      .get("result", {}))
+            if result.get("__typename") == "TweetWithVisibilityResults":
+                result = result.get("tweet", {})
+
+            legacy = result.get("legacy", {})
+            text = legacy.get("full_text", "").strip()
+            if not text:
+                continue
+
+            user = result.get("core", {}).get("user_results", {}).get("result", {}).get("legacy", {})
+            created_at = legacy.get("created_at", "")
+            try:
+                created_at = datetime.strptime(created_at, "%a %b %d %H:%M:%S %z %Y").isoformat()
+            except ValueError:
+                pass
+
+            posts.append({
+                "author": user.get("name") or "Unknown",
+                "text": text[:500],
+                "time": created_at,
+                "url": f"https://x.com/{user.get('screen_name', 'i')}/status/{result.get('rest_id', '')}",
+            })
+            if len(posts) >= limit:
+                return posts
+    return posts
+
+def fetch_posts_api(session_cookies, limit=20):
+    """
+    复用浏览器登录态直接请求 HomeTimeline GraphQL 接口
+    未配置 queryId、未登录或接口失败（如 401/403）时返回 None，由调用方回退到页面抓取
+    """
+    if not HAS_REQUESTS or not HOME_TIMELINE_QUERY_ID:
+        return None
+
+    cookies = {c["name"]: c["value"] for c in session_cookies}
+    if "ct0" not in cookies:
+        return None
+
+    url = f"https://x.com/i/api/graphql/{HOME_TIMELINE_QUERY_ID}/HomeTimeline"
+    headers = {
+        "authorization": f"Bearer {X_WEB_BEARER}",
+        "x-csrf-token": cookies["ct0"],
+        "x-twitter-auth-type": "OAuth2Session",
+        "x-twitter-active-user": "yes",
+    }
+    params = {
+        "variables": json.dumps({"count": limit, "includePromotedContent": False}),
+        "features": json.dumps(HOME_TIMELINE_FEATURES),
+    }
+
+    try:
+        resp = requests.get(url, headers=headers, cookies=cookies, params=params, timeout=10)
+    except requests.RequestException as e:
+        print(f"{datetime.now()} - HomeTimeline 接口请求失败：{e}")
+        return None
+
+    if resp.status_code != 200:
+        print(f"{datetime.now()} - HomeTimeline 接口返回 {resp.status_code}，回退到页面抓取")
+        return None
+
+    try:
+        instructions = resp.json()["data"]["home"]["home_timeline_urt"]["instructions"]
+    except (ValueError, KeyError, TypeError):
+        print(f"{datetime.now()} - HomeTimeline 响应格式无法识别，回退到页面抓取")
+        return None
+
+    return _parse_timeline(instructions, limit)
+
+async def block_heavy_resources(route):
+    """
+    page.route 处理函数：拦截图片、视频、字体和样式表
+    """
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def goto_with_retry(page, url, attempts=GOTO_ATTEMPTS, timeout=GOTO_TIMEOUT):
+    """
+    导航到 url，超时后重试，全部失败时抛出最后一次的超时异常
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            return await page.goto(url, wait_until="domcontentloaded", timeout=timeout)
+        except PlaywrightTimeoutError:
+            if attempt == attempts:
+                raise
+            print(f"{datetime.now()} - 导航超时，重试 {attempt}/{attempts - 1}...")
+
+async def fetch_posts_from_browser(browser, limit=20, scrolls=3):
+    """
+    在已连接的浏览器中获取帖子（优先 GraphQL 接口，失败时渲染页面提取）
+    """
+    context = browser.contexts[0] if browser.contexts else await browser.new_context()
+
+    # 配置了 queryId 时优先直连 GraphQL 接口，无需渲染页面
+    if HAS_REQUESTS and HOME_TIMELINE_QUERY_ID:
+        cookies = await context.cookies("https://x.com")
+        api_posts = await asyncio.to_thread(fetch_posts_api, cookies, limit)
+        if api_posts:
+            print(f"{datetime.now()} - 通过 HomeTimeline 接口获取 {len(api_posts)} 个帖子")
+            return api_posts
+
+    page = await context.new_page()
+    await page.route("**/*", block_heavy_resources)
+
+    try:
+        print(f"{datetime.now()} - 导航到 x.com...")
+        await goto_with_retry(page, "https://x.com/home")
+        print(f"{datetime.now()} - 成功访问 x.com")
+
+        # 等待帖子元素渲染
+        if await wait_for_articles(page):
+            print(f"{datetime.now()} - 页面内容已加载")
+        else:
+            # 即使没有找到 article，也继续尝试提取
+            print(f"{datetime.now()} - 警告：等待帖子超时，继续尝试...")
+
+        print(f"{datetime.now()} - 滚动加载更多...")
+        await auto_scroll(page, scrolls)
+
+        print(f"{datetime.now()} - 提取帖子内容...")
+        posts = await extract_posts(page, limit)
+        print(f"{datetime.now()} - 成功获取 {len(posts)} 个帖子")
+        return posts
+    finally:
+        # 只关闭本次打开的页面，保留用户的 Chrome 继续运行
+        await page.close()
+
+async def fetch_posts_over_cdp(port=DEBUG_PORT, limit=20, scrolls=3):
+    """
+    通过远程调试连接已登录的 Chrome 访问 x.com 并提取帖子
+    """
+    if not HAS_PLAYWRIGHT:
+        print("❌ Playwright 未安装")
+        return []
+
+    # 复用常驻的调试 Chrome，避免每次冷启动浏览器
+    if not start_remote_debugging(port):
+        print("❌ 无法启动 Chrome 远程调试")
+        return []
+
+    try:
+        async with async_playwright() as p:
+            print(f"{datetime.now()} - 连接到 Chrome 远程调试端口 {port}...")
+            browser = await p.chromium.connect_over_cdp(f"http://localhost:{port}")
+            return await fetch_posts_from_browser(browser, limit, scrolls)
+    except Exception as e:
+        print(f"{datetime.now()} - 错误：{e}")
+        import traceback
+        traceback.print_exc()
+        return []
+
+async def _daemon_request(request, socket_path):
+    """
+    向守护进程发送一行 JSON 请求并读取完整回复
+    """
+    reader, writer = await asyncio.open_unix_connection(socket_path)
+    try:
+        writer.write(json.dumps(request).encode("utf-8") + b"\n")
+        await writer.drain()
+        return json.loads(await reader.read())
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+async def fetch_posts_via_daemon(limit=20, scrolls=3, socket_path=DAEMON_SOCKET, timeout=DAEMON_TIMEOUT):
+    """
+    通过 x-summary-daemon.py 获取帖子；守护进程未运行、超时、无回复或抓取失败时返回 None
+    """
+    request = {"cmd": "fetch", "limit": limit, "scrolls": scrolls}
+    try:
+        response = await asyncio.wait_for(_daemon_request(request, socket_path), timeout)
+    except FileNotFoundError:
+        return None
+    except (asyncio.TimeoutError, OSError, json.JSONDecodeError) as e:
+        print(f"{datetime.now()} - 守护进程不可用：{e!r}")
+        return None
+
+    if not response.get("ok"):
+        print(f"{datetime.now()} - 守护进程抓取失败：{response.get('error')}")
+        return None
+
+    print(f"{datetime.now()} - 通过守护进程获取 {len(response['posts'])} 个帖子")
+    return response["posts"]
+
+def save_posts(posts, path=SUMMARY_FILE):
+    """
+    保存帖子到 Markdown 文件
+    """
+    parts = [
+        "# X.com 每日综述\n\n",
+        f"📅 时间：{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n",
+        f"📊 共获取 {len(posts)} 条帖子\n\n",
+        "---\n\n",
+    ]
+
+    for i, post in enumerate(posts, 1):
+        parts.append(f"### {i}. {post['author']}\n\n{post['text']}\n\n")
+        if post.get('url'):
+            parts.append(f"[查看原文]({post['url']})\n\n")
+        if post.get('time'):
+            parts.append(f"_时间：{post['time']}_\n\n")
+        parts.append("---\n\n")
+
+    path.write_text("".join(parts))
+    return path
+
+async def save_posts_async(posts, path=SUMMARY_FILE):
+    """
+    在线程池中保存帖子，避免磁盘写入阻塞事件循环
+    """
+    return await asyncio.to_thread(save_posts, posts, path)
@@ -21,9 +21,33 @@ import random
 import time
 import subprocess
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import re
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import queue
+import atexit
+import itertools
+import fcntl
+import urllib.request
+from urllib.parse import urlsplit
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+
+try:
+    import websocket  # websocket-client，直连 CDP 时需要
+    HAS_WEBSOCKET = True
+except ImportError:
+    HAS_WEBSOCKET = False
+
+try:
+    import orjson  # 可选，解析 JSON 比标准库快数倍
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# orjson 可直接解析 bytes；其 JSONDecodeError 是 json.JSONDecodeError 的子类
+_json_loads = orjson.loads if HAS_ORJSON else json.loads
 
 
 # ============================================================================
@@ -42,23 +66,31 @@ class Config:
     # 超时配置（秒）
     page_load_timeout: int = 5
     scroll_check_interval: float = 0.5
+    scroll_settle_timeout: float = 2.0  # 直连 CDP 时，翻页后最多等待新帖渲染的时间
     scroll_max_attempts: int = 10
     scroll_no_new_threshold: int = 2  # 连续 2 次没新帖就停止（优化：从 3 次降为 2 次）
     scroll_max_consecutive_errors: int = 3
     scroll_early_stop_on_yesterday: bool = True  # 检测到昨天的帖子就立即停止
     user_crawl_timeout: int = 120  # 2 分钟
+    api_connect_timeout: float = 5  # 内容 API 建立连接超时，读超时由各 API 单独指定
 
     # 重试配置
     max_retries: int = 5
     browser_action_max_attempts: int = 2
+    api_max_retries: int = 2  # 内容 API 遇到连接错误或 5xx 时的重试次数（读超时不重试）
 
     # 并发配置
-    content_fetch_workers: int = 10
+    content_fetch_workers: int = 20  # 内容获取线程数，为单主机上限的 2 倍，让两个 API 主机的请求可以重叠
     user_crawl_workers: int = 5  # 用户抓取并发数
+    per_host_concurrency: int = 10  # 同一 API 主机的最大并发请求数，避免被限流
 
     # 浏览器配置
     browser_max_restarts: int = 10
     browser_restart_backoff: int = 30
+    # openclaw 浏览器的远程调试端口；设置后 navigate/evaluate/press 直连 CDP（需要 websocket-client）
+    # 未设置时读取环境变量 CRAW_HOT_CDP_PORT，都没有则每个操作调用 openclaw 子进程
+    cdp_port: Optional[int] = None
+    cdp_navigate_timeout: int = 15
 
     # 请求头
     request_headers: Dict[str, str] = None
@@ -71,6 +103,10 @@ class Config:
         self.request_headers = {
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
         }
+        if self.cdp_port is None:
+            env_port = os.environ.get("CRAW_HOT_CDP_PORT", "").strip()
+            if env_port.isdigit():
+                self.cdp_port = int(env_port)
 
 
 # ============================================================================
@@ -96,20 +132,76 @@ class CrawlTimeoutError(Exception):
 # 日志模块
 # ============================================================================
 
+# 已确认存在的日志目录，避免每次构造 Logger 都 mkdir
+_dirs_created: set = set()
+
+
 class Logger:
-    """日志工具"""
+    """日志工具（文件只打开一次，由后台线程批量写入）"""
+
+    FLUSH_INTERVAL = 0.2  # 秒
+    FLUSH_LINES = 256
 
     def __init__(self, log_file: Path):
         self.log_file = log_file
-        self.log_file.parent.mkdir(parents=True, exist_ok=True)
+        log_dir = self.log_file.parent
+        if log_dir not in _dirs_created:
+            log_dir.mkdir(parents=True, exist_ok=True)
+            _dirs_created.add(log_dir)
+
+        self._fh = open(self.log_file, "a", encoding="utf-8", buffering=65536)
+        self._ts_second = -1
+        self._ts_text = ""
+        self._queue: queue.Queue = queue.Queue()
+        self._writer = threading.Thread(target=self._drain, name="logger-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def _drain(self) -> None:
+        """后台线程：从队列取日志写入文件，每 FLUSH_LINES 行或 FLUSH_INTERVAL 秒刷新一次"""
+        pending = 0
+        last_flush = time.monotonic()
+
+        while True:
+            try:
+                line = self._queue.get(timeout=self.FLUSH_INTERVAL)
+            except queue.Empty:
+                line = ""
+
+            if line is None:
+                break
+
+            if line:
+                self._fh.write(line)
+                pending += 1
+
+            now = time.monotonic()
+            if pending and (pending >= self.FLUSH_LINES or now - last_flush >= self.FLUSH_INTERVAL):
+                self._fh.flush()
+                pending = 0
+                last_flush = now
+
+        self._fh.flush()
 
     def log(self, level: str, message: str) -> None:
         """写入日志"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        # 时间戳精确到秒，同一秒内复用上次格式化的结果
+        now = int(time.time())
+        if now != self._ts_second:
+            self._ts_text = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+            self._ts_second = now
+        timestamp = self._ts_text
         log_line = f"[{timestamp}] [{level}] {message}\n"
         print(log_line.strip())
-        with open(self.log_file, "a", encoding="utf-8") as f:
-            f.write(log_line)
+        self._queue.put(log_line)
+
+    def close(self) -> None:
+        """写完队列中剩余的日志并关闭文件"""
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+        if not self._fh.closed:
+            self._fh.close()
 
     def info(self, message: str) -> None:
         self.log("INFO", message)
@@ -133,33 +225,37 @@ class ProcessLock:
 
     def __init__(self, lock_file: Path):
         self.lock_file = lock_file
-        self.lock_fd = None
+        self.lock_fd: Optional[int] = None
 
     def acquire(self) -> bool:
-        """尝试获取锁"""
+        """尝试获取锁（直接使用文件描述符，不经过 Python 文件对象）"""
         try:
-            import fcntl
-            self.lock_fd = open(self.lock_file, 'w')
-            fcntl.flock(self.lock_fd.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
-            self.lock_fd.write(str(os.getpid()))
-            self.lock_fd.flush()
-            return True
-        except (IOError, BlockingIOError):
+            fd = os.open(self.lock_file, os.O_WRONLY | os.O_CREAT, 0o644)
+        except OSError:
+            return False
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
             return False
 
+        # 拿到锁之后再清空文件写入 PID，避免覆盖持锁进程的 PID
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self.lock_fd = fd
+        return True
+
     def release(self) -> None:
         """释放锁"""
-        if self.lock_fd:
-            import fcntl
-            fcntl.flock(self.lock_fd.fileno(), fcntl.LOCK_UN)
-            self.lock_fd.close()
+        if self.lock_fd is not None:
+            fcntl.flock(self.lock_fd, fcntl.LOCK_UN)
+            os.close(self.lock_fd)
             self.lock_fd = None
 
-        if self.lock_file.exists():
-            try:
-                self.lock_file.unlink()
-            except:
-                pass
+        try:
+            self.lock_file.unlink()
+        except FileNotFoundError:
+            pass
 
     def __enter__(self):
         return self.acquire()
@@ -172,96 +268,269 @@ class ProcessLock:
 # 浏览器客户端模块
 # ============================================================================
 
-class BrowserClient:
-    """浏览器操作客户端（封装 subprocess 调用）"""
+# openclaw 输出中的有效值：以 {、[、" 开头的 JSON，或单独一行的 true/false/整数
+# （直接在 bytes 上匹配，只在找到的值处解码）
+_OUTPUT_VALUE_RE = re.compile(
+    rb'^[ \t\r]*(?:(?P<json>[\{\["])|(?P<scalar>true|false|-?\d+)[ \t\r]*$)',
+    re.MULTILINE
+)
+_JSON_DECODER = json.JSONDecoder()
+
+
+class CDPClient:
+    """Chrome DevTools Protocol 客户端（单个持久 WebSocket 连接，省去每次操作启动 openclaw 子进程）"""
+
+    KEY_CODES = {"PageDown": 34, "PageUp": 33, "End": 35, "Home": 36, "Enter": 13, "Escape": 27}
 
     def __init__(self, config: Config, logger: Logger):
         self.config = config
         self.logger = logger
-        self.restart_count = 0
+        self.target_id: Optional[str] = None
+        self._ws = None
+        self._next_id = 0
+        self._events: List[Dict] = []
+        self._scripts: Dict[str, str] = {}  # 源码 -> 已编译的 scriptId（随页面上下文失效）
+
+    def _http_json(self, path: str, method: str = "GET") -> Any:
+        """请求 CDP 的 HTTP 端点"""
+        request = urllib.request.Request(f"http://127.0.0.1:{self.config.cdp_port}{path}", method=method)
+        with urllib.request.urlopen(request, timeout=5) as resp:
+            return _json_loads(resp.read())
+
+    @property
+    def connected(self) -> bool:
+        return self._ws is not None
+
+    def connect(self, target_id: Optional[str] = None) -> None:
+        """连接到指定页面（默认第一个页面，没有则新建）"""
+        pages = [t for t in self._http_json("/json/list") if t.get("type") == "page"]
+        target = next((t for t in pages if t.get("id") == target_id), pages[0] if pages else None)
+        if target is None:
+            target = self._http_json("/json/new", method="PUT")
+
+        # 不发送 Origin 头：Chrome 111+ 未加 --remote-allow-origins 时会以 403 拒绝带 Origin 的连接
+        self._ws = websocket.create_connection(target["webSocketDebuggerUrl"], timeout=30, suppress_origin=True)
+        self.target_id = target["id"]
+        self.send("Page.enable")
+        self.logger.debug(f"CDP connected to target {self.target_id}")
+
+    def close(self) -> None:
+        """断开连接（不关闭浏览器）"""
+        if self._ws is not None:
+            try:
+                self._ws.close()
+            except Exception:
+                pass
+        self._ws = None
+        self._events.clear()
+        self._scripts.clear()
+
+    def send(self, method: str, params: Optional[Dict] = None) -> Dict:
+        """发送 CDP 命令并等待对应的返回（期间收到的事件暂存起来）"""
+        self._next_id += 1
+        msg_id = self._next_id
+        self._ws.send(json.dumps({"id": msg_id, "method": method, "params": params or {}}))
+
+        while True:
+            message = _json_loads(self._ws.recv())
+            if message.get("id") == msg_id:
+                break
+            if "method" in message:
+                self._events.append(message)
 
-    def _run_command(self, args: List[str], timeout: int = 30) -> subprocess.CompletedProcess:
-        """运行命令"""
-        return subprocess.run(
-            args,
-            capture_output=True,
-            text=True,
-            timeout=timeout
-        )
+        if "error" in message:
+            raise BrowserActionError(f"{method} failed: {message['error'].get('message')}")
+        return message.get("result", {})
 
-    def _parse_output(self, output: str) -> Optional[Dict]:
-        """解析浏览器命令输出（支持 JSON、布尔值）"""
-        lines = output.strip().split('\n')
+    def _wait_event(self, method: str, timeout: float) -> bool:
+        """等待指定 CDP 事件"""
+        if any(e.get("method") == method for e in self._events):
+            return True
 
-        # 从前往后找 JSON 开始（{, [, "）
-        json_start = None
-        for i, line in enumerate(lines):
-            line_stripped = line.strip()
+        deadline = time.monotonic() + timeout
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._ws.settimeout(remaining)
+                message = _json_loads(self._ws.recv())
+                if message.get("method") == method:
+                    return True
+        except websocket.WebSocketTimeoutException:
+            return False
+        finally:
+            self._ws.settimeout(30)
+
+    def navigate(self, url: str) -> None:
+        """导航并等待 DOMContentLoaded"""
+        self._events.clear()
+        self._scripts.clear()
+        result = self.send("Page.navigate", {"url": url})
+        if result.get("errorText"):
+            raise BrowserActionError(f"Navigation failed: {result['errorText']}")
+        if not self._wait_event("Page.domContentEventFired", self.config.cdp_navigate_timeout):
+            self.logger.warning(f"DOMContentLoaded not fired within {self.config.cdp_navigate_timeout}s")
+
+    def evaluate(self, expression: str, cache_script: bool = False) -> Any:
+        """执行 JavaScript 并按值返回结果
+
+        cache_script=True 时脚本在当前页面只编译一次（Runtime.compileScript），
+        之后用 Runtime.runScript 直接运行，省去 V8 每次的解析和编译
+        """
+        if cache_script:
+            result = self.send("Runtime.runScript", {
+                "scriptId": self._compile(expression),
+                "returnByValue": True,
+                "awaitPromise": True,
+            })
+        else:
+            result = self.send("Runtime.evaluate", {
+                "expression": expression,
+                "returnByValue": True,
+                "awaitPromise": True,
+            })
+        if result.get("exceptionDetails"):
+            raise BrowserActionError(f"JS exception: {result['exceptionDetails'].get('text')}")
+        return result.get("result", {}).get("value")
+
+    def _compile(self, expression: str) -> str:
+        """编译脚本并缓存 scriptId"""
+        script_id = self._scripts.get(expression)
+        if script_id is None:
+            result = self.send("Runtime.compileScript", {
+                "expression": expression,
+                "sourceURL": f"craw_hot_{len(self._scripts)}.js",
+                "persistScript": True,
+            })
+            if result.get("exceptionDetails"):
+                raise BrowserActionError(f"JS compile error: {result['exceptionDetails'].get('text')}")
+            script_id = self._scripts[expression] = result["scriptId"]
+        return script_id
+
+    def press(self, key: str) -> None:
+        """按键（keyDown + keyUp）"""
+        code = self.KEY_CODES.get(key, 0)
+        for event_type in ("keyDown", "keyUp"):
+            self.send("Input.dispatchKeyEvent", {
+                "type": event_type,
+                "key": key,
+                "code": key,
+                "windowsVirtualKeyCode": code,
+                "nativeVirtualKeyCode": code,
+            })
 
-            # 跳过调试信息（以 │, ├, ╯, ◇ 等开头的行）
-            if line_stripped.startswith(('│', '├', '╯', '◇')):
-                continue
 
-            # 找到 JSON 开始
-            if line_stripped and (line_stripped.startswith('{') or line_stripped.startswith('"') or line_stripped.startswith('[')):
-                json_start = i
-                break
+class BrowserClient:
+    """浏览器操作客户端（优先直连 CDP，否则封装 openclaw subprocess 调用）"""
+
+    # 等待第一个 article 出现的 Promise（%d 为超时毫秒数，超时 resolve(false)）
+    WAIT_ARTICLE_JS = """new Promise(resolve => {
+        if (document.querySelector('article')) return resolve(true);
+        const observer = new MutationObserver(() => {
+            if (document.querySelector('article')) {
+                observer.disconnect();
+                resolve(true);
+            }
+        });
+        observer.observe(document.documentElement, {childList: true, subtree: true});
+        setTimeout(() => { observer.disconnect(); resolve(false); }, %d);
+    })"""
+
+    # 等待新的 article 节点插入页面的 Promise（%d 为超时毫秒数，超时 resolve(false)）
+    NEW_ARTICLE_JS = """new Promise(resolve => {
+        const observer = new MutationObserver(mutations => {
+            for (const mutation of mutations) {
+                for (const node of mutation.addedNodes) {
+                    if (node.nodeType === 1 && (node.matches('article') || node.querySelector('article'))) {
+                        observer.disconnect();
+                        return resolve(true);
+                    }
+                }
+            }
+        });
+        observer.observe(document.body, {childList: true, subtree: true});
+        setTimeout(() => { observer.disconnect(); resolve(false); }, %d);
+    })"""
 
-            # 处理布尔值
-            if line_stripped == "true":
-                return {"ok": True, "result": True}
-            if line_stripped == "false":
-                return {"ok": True, "result": False}
+    def __init__(self, config: Config, logger: Logger):
+        self.config = config
+        self.logger = logger
+        self.restart_count = 0
+        self.target_id: Optional[str] = None
 
-            # 处理数字（新增）
-            if line_stripped.lstrip('-').isdigit():
-                return {"ok": True, "result": int(line_stripped)}
+        # 浏览器生命周期（start/stop/status）仍由 openclaw 管理
+        self.cdp: Optional[CDPClient] = None
+        if self.config.cdp_port:
+            if HAS_WEBSOCKET:
+                self.cdp = CDPClient(config, logger)
+            else:
+                self.logger.warning("websocket-client not installed, falling back to openclaw subprocess")
 
-        if json_start is not None:
-            # 从 JSON 开始行合并后续行直到找到完整的 JSON
-            json_text = lines[json_start]
+    def _cdp_call(self, action: str, func: Callable) -> tuple[bool, Any]:
+        """通过 CDP 执行操作；失败时断开连接，返回 (False, None) 由调用方回退到 subprocess
 
-            for j in range(json_start + 1, len(lines)):
-                json_text += '\n' + lines[j]
-                try:
-                    response = json.loads(json_text)
-                    if isinstance(response, str):
-                        return {"ok": True, "result": response}
-                    elif isinstance(response, dict):
-                        if response.get("ok"):
-                            return response
-                        else:
-                            return {"ok": True, "result": response.get("result")}
-                    else:
-                        return {"ok": True, "result": response}
-                except json.JSONDecodeError:
-                    # JSON 还不完整，继续合并
-                    continue
+        连接本身失败时本次运行不再尝试 CDP，避免每个操作都重复握手
+        """
+        if self.cdp is None:
+            return False, None
+        if not self.cdp.connected:
+            try:
+                self.cdp.connect(self.target_id)
+            except Exception as e:
+                self.logger.warning(f"CDP connect failed, using openclaw for the rest of this run: {str(e)}")
+                self.cdp.close()
+                self.cdp = None
+                return False, None
+        try:
+            return True, func()
+        except Exception as e:
+            self.logger.warning(f"CDP {action} failed, falling back to openclaw: {str(e)}")
+            self.cdp.close()
+            return False, None
 
-            # 循环结束后，再次尝试解析（处理单行 JSON 的情况）
+    def _run_command(self, args: List[str], timeout: int = 30) -> subprocess.CompletedProcess:
+        """运行命令（输出保留为 bytes，需要时再解码）"""
+        return subprocess.run(
+            args,
+            capture_output=True,
+            timeout=timeout
+        )
+
+    def _parse_output(self, output: bytes) -> Optional[Dict]:
+        """解析浏览器命令输出（支持 JSON、布尔值、数字）"""
+        # 按出现顺序查找第一个 JSON 起始行或标量行（│, ├ 等调试装饰行不会匹配）
+        for match in _OUTPUT_VALUE_RE.finditer(output):
+            scalar = match.group("scalar")
+            if scalar is not None:
+                if scalar == b"true":
+                    return {"ok": True, "result": True}
+                if scalar == b"false":
+                    return {"ok": True, "result": False}
+                return {"ok": True, "result": int(scalar)}
+
+            # 从 JSON 起始位置解码并一次性解析，忽略其后的多余输出
+            text = output[match.start("json"):].decode("utf-8", errors="replace")
             try:
-                response = json.loads(json_text)
-                if isinstance(response, str):
-                    return {"ok": True, "result": response}
-                elif isinstance(response, dict):
-                    if response.get("ok"):
-                        return response
-                    else:
-                        return {"ok": True, "result": response.get("result")}
-                else:
-                    return {"ok": True, "result": response}
+                response, _ = _JSON_DECODER.raw_decode(text)
             except json.JSONDecodeError:
-                # 合并了所有行还是无法解析
-                self.logger.warning(f"Failed to parse JSON: {json_text[:100]}")
+                self.logger.debug(f"Failed to parse JSON: {text[:100]}")
+                continue
+
+            if isinstance(response, dict) and not response.get("ok"):
+                return {"ok": True, "result": response.get("result")}
+            if isinstance(response, dict):
+                return response
+            return {"ok": True, "result": response}
 
         # 没有找到有效输出
-        self.logger.debug(f"Cannot find valid output. Lines: {lines[:10]}")  # 显示前 10 行用于调试
+        self.logger.debug(f"Cannot find valid output: {output[:300]!r}")
         return None
 
     def _check_tab_not_found(self, result: subprocess.CompletedProcess) -> bool:
         """检查是否有 tab not found 错误"""
         output = result.stderr + result.stdout
-        return "tab not found" in output.lower()
+        return b"tab not found" in output.lower()
 
     def _execute_action(self, action: str, **kwargs) -> Optional[Dict]:
         """执行浏览器操作（带重试和自动恢复）"""
@@ -282,7 +551,7 @@ class BrowserClient:
                 if result.returncode == 0:
                     return self._parse_output(result.stdout)
                 else:
-                    self.logger.error(f"Command failed: {result.stderr}")
+                    self.logger.error(f"Command failed: {result.stderr.decode('utf-8', errors='replace')}")
                     return None
 
             except subprocess.TimeoutExpired:
@@ -303,6 +572,10 @@ class BrowserClient:
         self.restart_count += 1
         self.logger.info(f"Attempting browser restart ({self.restart_count}/{self.config.browser_max_restarts})...")
 
+        # 浏览器重启后旧的 CDP 连接失效
+        if self.cdp:
+            self.cdp.close()
+
         try:
             # 停止
             self.logger.info("Stopping browser...")
@@ -329,7 +602,7 @@ class BrowserClient:
         """检查浏览器状态"""
         try:
             result = self._run_command(["openclaw", "browser", "status"], timeout=10)
-            return result.returncode == 0 and "enabled: true" in result.stdout
+            return result.returncode == 0 and b"enabled: true" in result.stdout
         except Exception:
             return False
 
@@ -349,6 +622,11 @@ class BrowserClient:
     def navigate(self, url: str) -> bool:
         """导航到 URL"""
         self.logger.info(f"Navigating to {url}")
+        ok, _ = self._cdp_call("navigate", lambda: self.cdp.navigate(url))
+        if ok:
+            self.target_id = self.cdp.target_id
+            return True
+
         result = self._execute_action(
             action="navigate",
             cmd=["openclaw", "browser", "navigate", "--json", url]
@@ -358,12 +636,17 @@ class BrowserClient:
             return True
         return False
 
-    def evaluate(self, js_code: str) -> Optional[Any]:
-        """执行 JavaScript"""
+    def evaluate(self, js_code: str, cache_script: bool = False) -> Optional[Any]:
+        """执行 JavaScript（cache_script：直连 CDP 时复用编译好的脚本，适合反复执行的同一段代码）"""
         if not self.target_id:
             self.logger.warning("No targetId available, cannot evaluate")
             return None
 
+        # CDP 按值返回，无需再解析 openclaw 的输出
+        ok, value = self._cdp_call("evaluate", lambda: self.cdp.evaluate(js_code, cache_script))
+        if ok:
+            return value
+
         result = self._execute_action(
             action="evaluate",
             cmd=["openclaw", "browser", "evaluate", "--target-id", self.target_id, "--fn", js_code]
@@ -385,11 +668,11 @@ class BrowserClient:
         # 如果是字符串且以 [ 或 { 开头，尝试解析
         if isinstance(result_value, str) and result_value.strip().startswith(('[', '{')):
             try:
-                result_value = json.loads(result_value)
+                result_value = _json_loads(result_value)
                 self.logger.debug(f"Parsed evaluate result: string -> {type(result_value)}")
                 # 解析后可能还是字符串（双重转义）
                 if isinstance(result_value, str) and result_value.strip().startswith(('[', '{')):
-                    result_value = json.loads(result_value)
+                    result_value = _json_loads(result_value)
                     self.logger.debug(f"Double-parsed evaluate result: string -> {type(result_value)}")
             except json.JSONDecodeError as e:
                 self.logger.warning(f"Failed to parse evaluate result: {e}")
@@ -399,14 +682,38 @@ class BrowserClient:
 
     def press(self, key: str) -> bool:
         """按键"""
+        ok, _ = self._cdp_call("press", lambda: self.cdp.press(key))
+        if ok:
+            return True
+
         result = self._execute_action(
             action="press",
             cmd=["openclaw", "browser", "press", key]
         )
         return result is not None
 
+    def wait_for_new_articles(self, timeout: float) -> Optional[bool]:
+        """等待翻页后新帖渲染（仅直连 CDP 时可用，否则返回 None 由调用方自行等待）"""
+        ok, rendered = self._cdp_call(
+            "wait_for_new_articles",
+            lambda: self.cdp.evaluate(self.NEW_ARTICLE_JS % int(timeout * 1000))
+        )
+        return bool(rendered) if ok else None
+
     def wait_for_content_loaded(self, timeout: int) -> bool:
         """智能等待：检查页面是否真的加载完成"""
+        # CDP 可等待 Promise：页面内用 MutationObserver 等第一个 article 出现，一次往返即可
+        ok, loaded = self._cdp_call(
+            "wait_for_content_loaded",
+            lambda: self.cdp.evaluate(self.WAIT_ARTICLE_JS % int(timeout * 1000))
+        )
+        if ok:
+            if loaded is True:
+                self.logger.debug("Content loaded successfully")
+                return True
+            self.logger.warning(f"Content not fully loaded after {timeout}s, proceeding anyway")
+            return False
+
         js_code = "document.querySelectorAll('article').length > 0"
 
         start_time = time.time()
@@ -425,6 +732,11 @@ class BrowserClient:
 # Twitter API 模块
 # ============================================================================
 
+# 帖子 URL 中的 tweet ID（status / statuses 两种写法合并为一次匹配）
+_TWEET_ID_RE = re.compile(r'(?:x\.com|twitter\.com)/\w+/status(?:es)?/(\d+)')
+_HOST_RE = re.compile(r'x\.com|twitter\.com')
+
+
 class TwitterApiClient:
     """Twitter API 客户端（fxtwitter + syndication）"""
 
@@ -432,13 +744,47 @@ class TwitterApiClient:
         self.config = config
         self.logger = logger
 
+        # 所有抓取线程共用一个 Session，复用到同一主机的 TCP/TLS 连接
+        self.session = requests.Session()
+        self.session.headers.update(self.config.request_headers)
+        # 重试在主机信号量内进行，只重试代价小的失败：
+        # 读超时不重试（否则一次卡住的请求要等 3 倍读超时），
+        # 429 不重试（立即重发只会加重限流，直接回退到下一个 API），
+        # 也不等待 Retry-After（可能很长，会让其他线程长时间排队）
+        retry = Retry(
+            total=self.config.api_max_retries,
+            read=0,
+            backoff_factor=0.3,
+            status_forcelist=(500, 502, 503, 504),
+            raise_on_status=False,  # 重试用尽后返回最后的响应，由调用方按状态码回退
+            respect_retry_after_header=False,
+        )
+        # 连接池按主机划分，单主机的在途请求不超过 per_host_concurrency
+        adapter = HTTPAdapter(pool_maxsize=self.config.per_host_concurrency, max_retries=retry)
+        self.session.mount("https://", adapter)
+
+        # 每个 API 主机一个信号量，限制对同一来源的并发请求
+        self._host_semaphores: Dict[str, threading.Semaphore] = {}
+        self._host_semaphores_lock = threading.Lock()
+
+    def _get(self, url: str, read_timeout: float) -> requests.Response:
+        """GET 请求（受所在主机的并发上限约束）"""
+        host = urlsplit(url).netloc
+        with self._host_semaphores_lock:
+            semaphore = self._host_semaphores.get(host)
+            if semaphore is None:
+                semaphore = self._host_semaphores[host] = threading.Semaphore(self.config.per_host_concurrency)
+
+        with semaphore:
+            return self.session.get(url, timeout=(self.config.api_connect_timeout, read_timeout), stream=False)
+
     def _fetch_via_fxtwitter(self, url: str) -> Optional[Dict]:
         """通过 fxtwitter API 获取内容"""
-        api_url = re.sub(r'(x\.com|twitter\.com)', 'api.fxtwitter.com', url)
+        api_url = _HOST_RE.sub('api.fxtwitter.com', url)
         try:
-            resp = requests.get(api_url, headers=self.config.request_headers, timeout=15)
+            resp = self._get(api_url, read_timeout=15)
             if resp.status_code == 200:
-                return resp.json()
+                return _json_loads(resp.content)
             self.logger.warning(f"fxtwitter API returned {resp.status_code}")
         except Exception as e:
             self.logger.warning(f"fxtwitter error: {str(e)}")
@@ -448,9 +794,9 @@ class TwitterApiClient:
         """通过 syndication API 获取内容"""
         url = f"https://cdn.syndication.twimg.com/tweet-result?id={tweet_id}&token=0"
         try:
-            resp = requests.get(url, headers=self.config.request_headers, timeout=10)
+            resp = self._get(url, read_timeout=10)
             if resp.status_code == 200:
-                return resp.json()
+                return _json_loads(resp.content)
             self.logger.warning(f"syndication API returned {resp.status_code}")
         except Exception as e:
             self.logger.warning(f"syndication error: {str(e)}")
@@ -481,35 +827,40 @@ class TwitterApiClient:
     @staticmethod
     def _extract_tweet_id(url: str) -> Optional[str]:
         """从 URL 提取 tweet ID"""
-        patterns = [
-            r'(?:x\.com|twitter\.com)/\w+/status/(\d+)',
-            r'(?:x\.com|twitter\.com)/\w+/statuses/(\d+)',
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, url)
-            if match:
-                return match.group(1)
-        return None
+        match = _TWEET_ID_RE.search(url)
+        return match.group(1) if match else None
 
 
 # ============================================================================
 # 帖子格式化模块
 # ============================================================================
 
+# X Article 内容块类型对应的 Markdown 前缀（unstyled 等其他类型无前缀）
+_BLOCK_PREFIX = {
+    "header-one": "# ",
+    "header-two": "## ",
+    "header-three": "### ",
+    "blockquote": "> ",
+    "unordered-list-item": "- ",
+    "ordered-list-item": "1. ",
+}
+
+
 class PostFormatter:
     """帖子内容格式化器"""
 
     def __init__(self, config: Config, logger: Logger):
         self.config = config
         self.logger = logger
+        self._formatters: Dict[str, Callable[[Dict, str], str]] = {
+            "fxtwitter": self._format_fxtwitter,
+            "syndication": self._format_syndication,
+        }
 
     def format_as_markdown(self, post_data: Dict, source: str, url: str) -> str:
         """将帖子数据格式化为 Markdown"""
-        if source == "fxtwitter":
-            return self._format_fxtwitter(post_data, url)
-        elif source == "syndication":
-            return self._format_syndication(post_data, url)
-        return ""
+        formatter = self._formatters.get(source)
+        return formatter(post_data, url) if formatter else ""
 
     def _format_fxtwitter(self, data: Dict, url: str) -> str:
         """格式化 fxtwitter 数据"""
@@ -521,121 +872,89 @@ class PostFormatter:
         else:
             return self._format_tweet(tweet, url)
 
+    @staticmethod
+    def _format_media(media_urls: List[str]) -> str:
+        """媒体段落（无媒体时为空串）"""
+        if not media_urls:
+            return ""
+        images = "\n".join(f"![媒体{i}]({m})" for i, m in enumerate(media_urls, 1))
+        return f"## 媒体\n\n{images}\n\n"
+
     def _format_syndication(self, data: Dict, url: str) -> str:
         """格式化 syndication 数据"""
         user = data.get("user", {})
-        lines = [
-            f"# @{user.get('screen_name', '')} 的推文",
-            "",
-            f"> 作者: **{user.get('name', '')}** (@{user.get('screen_name', '')})",
-            f"> 发布时间: {data.get('created_at', '')}",
-            f"> 原文链接: {url}",
-            "",
-            "---",
-            "",
-            data.get("text", ""),
-            "",
-        ]
-
-        # 媒体
-        media_urls = [m.get("media_url_https") for m in data.get("mediaDetails", []) if m.get("media_url_https")]
-        if media_urls:
-            lines.extend(["## 媒体", ""])
-            lines.extend([f"![媒体{i}]({m})" for i, m in enumerate(media_urls, 1)])
-            lines.append("")
-
-        lines.extend([
-            "---",
-            "",
-            "## 互动数据",
-            "",
-            f"- ❤️ 点赞: {data.get('favorite_count', 0):,}",
-            f"- 🔁 转发: {data.get('retweet_count', 0):,}",
-        ])
+        name = user.get("name", "")
+        screen = user.get("screen_name", "")
+        media = self._format_media(
+            [m.get("media_url_https") for m in data.get("mediaDetails", []) if m.get("media_url_https")]
+        )
 
-        return "\n".join(lines)
+        return (
+            f"# @{screen} 的推文\n\n"
+            f"> 作者: **{name}** (@{screen})\n"
+            f"> 发布时间: {data.get('created_at', '')}\n"
+            f"> 原文链接: {url}\n\n"
+            f"---\n\n"
+            f"{data.get('text', '')}\n\n"
+            f"{media}"
+            f"---\n\n"
+            f"## 互动数据\n\n"
+            f"- ❤️ 点赞: {data.get('favorite_count', 0):,}\n"
+            f"- 🔁 转发: {data.get('retweet_count', 0):,}"
+        )
 
     def _format_article(self, tweet: Dict, article: Dict, url: str) -> str:
         """格式化 X Article"""
-        lines = [
-            f"# {article.get('title', 'Untitled')}",
-            "",
-            f"> 作者: **{tweet.get('author', {}).get('name', '')}** (@{tweet.get('author', {}).get('screen_name', '')})",
-            f"> 发布时间: {article.get('created_at', '')}",
-        ]
-
-        if article.get('modified_at'):
-            lines.append(f"> 修改时间: {article.get('modified_at', '')}")
-
-        lines.extend([
-            f"> 原文链接: {url}",
-            "",
-            "---",
-            "",
-        ])
+        author = tweet.get("author", {})
+        modified_at = article.get("modified_at")
+        cover_image = article.get("cover_image")
+        full_text = self._extract_article_content(article)
 
-        # 封面图
-        if article.get("cover_image"):
-            lines.extend([
-                f"![封面]({article.get('cover_image')})",
-                "",
-            ])
+        modified = f"> 修改时间: {modified_at}\n" if modified_at else ""
+        cover = f"![封面]({cover_image})\n\n" if cover_image else ""
+        body = f"{full_text}\n\n" if full_text else ""
 
-        # 正文
-        full_text = self._extract_article_content(article)
-        if full_text:
-            lines.extend([
-                full_text,
-                "",
-            ])
-
-        lines.extend([
-            "---",
-            "",
-            "## 互动数据",
-            "",
-            f"- ❤️ 点赞: {tweet.get('likes', 0):,}",
-            f"- 🔁 转发: {tweet.get('retweets', 0):,}",
-            f"- 👀 浏览: {tweet.get('views', 0):,}",
-            f"- 🔖 书签: {tweet.get('bookmarks', 0):,}",
-        ])
-
-        return "\n".join(lines)
+        return (
+            f"# {article.get('title', 'Untitled')}\n\n"
+            f"> 作者: **{author.get('name', '')}** (@{author.get('screen_name', '')})\n"
+            f"> 发布时间: {article.get('created_at', '')}\n"
+            f"{modified}"
+            f"> 原文链接: {url}\n\n"
+            f"---\n\n"
+            f"{cover}"
+            f"{body}"
+            f"---\n\n"
+            f"## 互动数据\n\n"
+            f"- ❤️ 点赞: {tweet.get('likes', 0):,}\n"
+            f"- 🔁 转发: {tweet.get('retweets', 0):,}\n"
+            f"- 👀 浏览: {tweet.get('views', 0):,}\n"
+            f"- 🔖 书签: {tweet.get('bookmarks', 0):,}"
+        )
 
     def _format_tweet(self, tweet: Dict, url: str) -> str:
         """格式化普通推文"""
-        lines = [
-            f"# @{tweet.get('author', {}).get('screen_name', '')} 的推文",
-            "",
-            f"> 作者: **{tweet.get('author', {}).get('name', '')}** (@{tweet.get('author', {}).get('screen_name', '')})",
-            f"> 发布时间: {tweet.get('created_at', '')}",
-            f"> 原文链接: {url}",
-            "",
-            "---",
-            "",
-            tweet.get("text", ""),
-            "",
-        ]
+        author = tweet.get("author", {})
+        name = author.get("name", "")
+        screen = author.get("screen_name", "")
+        media = self._format_media(
+            [m.get("url") for m in tweet.get("media", {}).get("all", []) if m.get("url")]
+        )
 
-        # 媒体
-        media_urls = [m.get("url") for m in tweet.get("media", {}).get("all", []) if m.get("url")]
-        if media_urls:
-            lines.extend(["## 媒体", ""])
-            lines.extend([f"![媒体{i}]({m})" for i, m in enumerate(media_urls, 1)])
-            lines.append("")
-
-        lines.extend([
-            "---",
-            "",
-            "## 互动数据",
-            "",
-            f"- ❤️ 点赞: {tweet.get('likes', 0):,}",
-            f"- 🔁 转发: {tweet.get('retweets', 0):,}",
-            f"- 👀 浏览: {tweet.get('views', 0):,}",
-            f"- 💬 回复: {tweet.get('replies', 0):,}",
-        ])
-
-        return "\n".join(lines)
+        return (
+            f"# @{screen} 的推文\n\n"
+            f"> 作者: **{name}** (@{screen})\n"
+            f"> 发布时间: {tweet.get('created_at', '')}\n"
+            f"> 原文链接: {url}\n\n"
+            f"---\n\n"
+            f"{tweet.get('text', '')}\n\n"
+            f"{media}"
+            f"---\n\n"
+            f"## 互动数据\n\n"
+            f"- ❤️ 点赞: {tweet.get('likes', 0):,}\n"
+            f"- 🔁 转发: {tweet.get('retweets', 0):,}\n"
+            f"- 👀 浏览: {tweet.get('views', 0):,}\n"
+            f"- 💬 回复: {tweet.get('replies', 0):,}"
+        )
 
     def _extract_article_content(self, article: Dict) -> Optional[str]:
         """从 X Article 中提取完整内容"""
@@ -643,60 +962,48 @@ class PostFormatter:
             return None
 
         content_blocks = article.get("content", {}).get("blocks", [])
-        paragraphs = []
+        return "\n\n".join(
+            _BLOCK_PREFIX.get(block.get("type", "unstyled"), "") + text
+            for block in content_blocks
+            if (text := block.get("text", "").strip())
+        )
 
-        for block in content_blocks:
-            text = block.get("text", "").strip()
-            block_type = block.get("type", "unstyled")
 
-            if not text:
-                continue
+# ============================================================================
+# 抓取模块
+# ============================================================================
 
-            type_to_format = {
-                "header-one": f"# {text}",
-                "header-two": f"## {text}",
-                "header-three": f"### {text}",
-                "blockquote": f"> {text}",
-                "unordered-list-item": f"- {text}",
-                "ordered-list-item": f"1. {text}",
-            }
+ONE_DAY_MS = 24 * 60 * 60 * 1000
+TWITTER_EPOCH_MS = 1288834974657
 
-            paragraphs.append(type_to_format.get(block_type, text))
 
-        return "\n\n".join(paragraphs)
+def _snowflake_ms(tweet_id: int) -> int:
+    """从 Snowflake ID 解出发帖时间（毫秒时间戳，高 41 位是相对 Twitter 纪元的毫秒数）"""
+    return (tweet_id >> 22) + TWITTER_EPOCH_MS
 
 
-# ============================================================================
-# 抓取模块
-# ============================================================================
+def _url_timestamp_ms(url: str) -> Optional[int]:
+    """从帖子 URL（https://x.com/<user>/status/<id>）解出发帖时间，无法解析时返回 None"""
+    tweet_id = url.rsplit('/status/', 1)[-1]
+    return _snowflake_ms(int(tweet_id)) if tweet_id.isdigit() else None
+
 
 class PostCrawler:
     """帖子抓取器"""
 
-    def __init__(self, config: Config, logger: Logger, browser: BrowserClient):
-        self.config = config
-        self.logger = logger
-        self.browser = browser
-
-    def _get_scroll_js(self) -> str:
-        """获取滚动的 JavaScript 代码"""
-        # 使用 IIFE 立即执行并返回结果（箭头函数隐式返回）
-        return """(() => {
+    # 滚动时按页面顺序收集帖子 URL 的 JavaScript（IIFE 立即执行并返回结果）
+    # 返回 [url, isContext] 列表：isContext 表示带 socialContext（转帖 / 置顶）的帖子，
+    # 其 URL 里的 ID 是原帖的，不能代表时间线位置；时间过滤由 Python 端根据 Snowflake ID 完成
+    SCROLL_JS = """(() => {
             const articles = document.querySelectorAll('article');
-            const now = new Date();
-            const oneDayAgo = new Date(now.getTime() - 24 * 60 * 60 * 1000);
+            const seen = new Set();
             const result = [];
 
             for (let i = 0; i < articles.length; i++) {
                 const article = articles[i];
-                const timeElement = article.querySelector('time');
-                if (!timeElement) continue;
-
-                const datetime = timeElement.getAttribute('datetime');
-                if (!datetime) continue;
-
-                const tweetDate = new Date(datetime);
-                if (tweetDate < oneDayAgo) continue;
+                // 没有时间的一般是广告
+                if (!article.querySelector('time')) continue;
+                const isContext = !!article.querySelector('[data-testid="socialContext"]');
 
                 const links = article.querySelectorAll('a[href*="/status/"]');
                 for (let j = 0; j < links.length; j++) {
@@ -705,8 +1012,9 @@ class PostCrawler:
                     if (href && href.includes('/status/')) {
                         const statusId = href.split('/status/')[1].split('/')[0];
                         const fullUrl = 'https://x.com' + href.split('/status/')[0] + '/status/' + statusId;
-                        if (!result.includes(fullUrl)) {
-                            result.push(fullUrl);
+                        if (!seen.has(fullUrl)) {
+                            seen.add(fullUrl);
+                            result.push([fullUrl, isContext]);
                         }
                         break;
                     }
@@ -716,8 +1024,20 @@ class PostCrawler:
             return result
         })()"""
 
-    def crawl_user(self, username: str) -> List[str]:
-        """抓取单个用户的帖子"""
+    def __init__(self, config: Config, logger: Logger, browser: BrowserClient):
+        self.config = config
+        self.logger = logger
+        self.browser = browser
+
+    @staticmethod
+    def _check_cancelled(cancel: Optional[threading.Event], username: str) -> None:
+        """抓取已超时被取消时抛出 CrawlTimeoutError，让工作线程尽快停止操作浏览器"""
+        if cancel is not None and cancel.is_set():
+            raise CrawlTimeoutError(f"Crawl for @{username} cancelled after timeout")
+
+    def crawl_user(self, username: str, cancel: Optional[threading.Event] = None) -> List[str]:
+        """抓取单个用户的帖子（cancel 被设置后在下一个检查点中止）"""
+        self._check_cancelled(cancel, username)
         self.logger.info(f"Starting crawl for @{username}")
 
         if not self.browser.ensure_available():
@@ -733,42 +1053,42 @@ class PostCrawler:
             time.sleep(random.uniform(1, 2))  # 备用等待
 
         # 滚动并收集 URL
-        urls = self._scroll_and_collect(username)
+        urls = self._scroll_and_collect(username, cancel)
 
         if not urls:
             raise NoPostsFoundError(f"No posts found for @{username} in the last 24 hours")
 
         return urls
 
-    def _scroll_and_collect(self, username: str) -> List[str]:
+    def _scroll_and_collect(self, username: str, cancel: Optional[threading.Event] = None) -> List[str]:
         """滚动页面并收集 URL（智能策略）"""
-        urls = []
-        seen_ids = set()
+        urls: Dict[str, None] = {}  # 有序去重：键即 URL，保持收集顺序
         no_new_count = 0
         consecutive_errors = 0
-        found_yesterday = False  # 检测是否找到昨天的帖子
+        one_day_ago = time.time() * 1000 - ONE_DAY_MS
+
+        def is_recent(url: str) -> bool:
+            ts = _url_timestamp_ms(url)
+            return ts is None or ts >= one_day_ago
 
         for scroll_num in range(1, self.config.scroll_max_attempts + 1):
+            self._check_cancelled(cancel, username)
             self.logger.debug(f"Scroll {scroll_num}/{self.config.scroll_max_attempts}")
 
             # 执行 JavaScript
-            js_code = self._get_scroll_js()
-            result = self.browser.evaluate(js_code)
+            result = self.browser.evaluate(self.SCROLL_JS, cache_script=True)
 
             if result is not None:
                 consecutive_errors = 0
                 try:
                     # result 可能已经是列表，或者需要 json.loads 解析
-                    if isinstance(result, list):
-                        page_urls = result
-                    else:
-                        page_urls = json.loads(result)
-                    new_urls = [u for u in page_urls if u not in seen_ids]
+                    page_items = result if isinstance(result, list) else _json_loads(result)
+                    page_urls = [url for url, _ in page_items]
+                    new_urls = [u for u in page_urls if u not in urls and is_recent(u)]
 
                     if new_urls:
                         self.logger.debug(f"Found {len(new_urls)} new URLs")
-                        seen_ids.update(new_urls)
-                        urls.extend(new_urls)
+                        urls.update(dict.fromkeys(new_urls))
                         no_new_count = 0
                     else:
                         no_new_count += 1
@@ -779,25 +1099,12 @@ class PostCrawler:
                             self.logger.info("No new posts for 2 scrolls, stopping early")
                             break
 
-                        # 优化：如果配置了，检测到昨天的帖子就立即停止
-                        # 通过观察第一个帖子的 URL 中的时间戳判断是否是昨天的
-                        if self.config.scroll_early_stop_on_yesterday and scroll_num == 1 and urls:
-                            first_url = urls[0]
-                            # 从 URL 中提取 tweet ID，判断时间
-                            # 格式：https://x.com/username/status/1234567890
-                            tweet_id = first_url.split('/status/')[-1]
-                            if tweet_id:
-                                tweet_timestamp = int(tweet_id)
-                                # Twitter 的 Snowflake ID 中，时间戳是前 41 位
-                                # 当前时间戳（毫秒）转换为秒
-                                import time as time_module
-                                current_ts = time_module.time() * 1000
-                                # 计算 24 小时前的时间戳
-                                one_day_ago = current_ts - (24 * 60 * 60 * 1000)
-                                if tweet_timestamp < one_day_ago:
-                                    self.logger.info("Detected yesterday's post, stopping immediately")
-                                    found_yesterday = True
-                                    break
+                    # 优化：页面上最后一条自己发布的帖子已早于 24 小时，说明已越过时间边界，立即停止
+                    # （转帖和置顶帖的 ID 属于原帖，不参与判断，避免转发旧帖时漏掉后面的新帖）
+                    own_urls = [url for url, is_context in page_items if not is_context]
+                    if self.config.scroll_early_stop_on_yesterday and own_urls and not is_recent(own_urls[-1]):
+                        self.logger.info("Detected yesterday's post, stopping immediately")
+                        break
                 except json.JSONDecodeError as e:
                     self.logger.error(f"Failed to parse URLs: {str(e)}")
                     consecutive_errors += 1
@@ -809,69 +1116,103 @@ class PostCrawler:
                 self.logger.error(f"Too many consecutive errors, giving up on @{username}")
                 break
 
-            # 优化：如果已经检测到昨天的帖子，立即停止
-            if found_yesterday:
-                break
-
             # 滚动
             if scroll_num < self.config.scroll_max_attempts:
                 self.browser.press("PageDown")
-                time.sleep(random.uniform(
-                    self.config.scroll_check_interval,
-                    self.config.scroll_check_interval * 2
-                ))
+                # 直连 CDP 时等到新帖渲染即继续（最多 scroll_settle_timeout），否则按原来的随机间隔等待
+                if self.browser.wait_for_new_articles(self.config.scroll_settle_timeout) is None:
+                    time.sleep(random.uniform(
+                        self.config.scroll_check_interval,
+                        self.config.scroll_check_interval * 2
+                    ))
 
         self.logger.info(f"Collected {len(urls)} URLs for @{username}")
-        return urls
+        return list(urls)
 
 
 # ============================================================================
 # 用户管理模块
 # ============================================================================
 
+def _normalize_username(username: str) -> str:
+    """规范化用户名：去掉首尾空白和开头的 @（文件与命令行使用同一规则）"""
+    return username.strip().lstrip("@")
+
+
 class UserManager:
-    """用户列表管理"""
+    """用户列表管理（内存缓存，文件 mtime 变化时重新加载）"""
 
     def __init__(self, config: Config, logger: Logger):
         self.config = config
         self.logger = logger
+        self._users: Optional[List[str]] = None
+        self._users_set: Optional[set] = None
+        self._mtime_ns: Optional[int] = None
 
-    def load(self) -> List[str]:
-        """加载用户列表"""
-        if not self.config.users_file.exists():
-            self.logger.warning(f"Users file not found: {self.config.users_file}")
-            return []
+    def _ensure_loaded(self) -> bool:
+        """确保缓存与文件一致，文件不存在时返回 False"""
+        try:
+            mtime_ns = os.stat(self.config.users_file).st_mtime_ns
+        except FileNotFoundError:
+            self._users, self._users_set, self._mtime_ns = [], set(), None
+            return False
+
+        if self._users is not None and mtime_ns == self._mtime_ns:
+            return True
 
         users = []
+        users_set = set()
         with open(self.config.users_file, "r", encoding="utf-8") as f:
             for line in f:
                 line = line.strip()
-                if line and not line.startswith("#"):
-                    users.append(line)
+                if not line or line.startswith("#"):
+                    continue
+                username = _normalize_username(line)
+                if username and username not in users_set:
+                    users.append(username)
+                    users_set.add(username)
 
+        self._users, self._users_set, self._mtime_ns = users, users_set, mtime_ns
         self.logger.info(f"Loaded {len(users)} users from {self.config.users_file}")
-        return users
+        return True
+
+    def load(self) -> List[str]:
+        """加载用户列表"""
+        if not self._ensure_loaded():
+            self.logger.warning(f"Users file not found: {self.config.users_file}")
+            return []
+        return list(self._users)
 
     def add(self, username: str) -> None:
         """添加用户"""
-        users = self.load()
-        if username in users:
+        username = _normalize_username(username)
+        if not username:
+            self.logger.warning("Empty username, ignored")
+            return
+        self._ensure_loaded()
+        if username in self._users_set:
             self.logger.warning(f"User already exists: {username}")
             return
 
-        users.append(username)
-        self._save(users)
+        self._users.append(username)
+        self._users_set.add(username)
+        self._save(self._users)
         self.logger.info(f"Added user: {username}")
 
     def remove(self, username: str) -> None:
         """删除用户"""
-        users = self.load()
-        if username not in users:
+        username = _normalize_username(username)
+        if not username:
+            self.logger.warning("Empty username, ignored")
+            return
+        self._ensure_loaded()
+        if username not in self._users_set:
             self.logger.warning(f"User not found: {username}")
             return
 
-        users.remove(username)
-        self._save(users)
+        self._users.remove(username)
+        self._users_set.discard(username)
+        self._save(self._users)
         self.logger.info(f"Removed user: {username}")
 
     def list(self) -> None:
@@ -882,10 +1223,10 @@ class UserManager:
             self.logger.info(f"  {i}. {user}")
 
     def _save(self, users: List[str]) -> None:
-        """保存用户列表"""
+        """保存用户列表（一次写入）"""
         with open(self.config.users_file, "w", encoding="utf-8") as f:
-            for user in users:
-                f.write(f"{user}\n")
+            f.write("".join(f"{user}\n" for user in users))
+        self._mtime_ns = os.stat(self.config.users_file).st_mtime_ns
         self.logger.info(f"Saved {len(users)} users")
 
 
@@ -893,14 +1234,31 @@ class UserManager:
 # 文件管理模块
 # ============================================================================
 
+# Markdown 结果文件中的固定片段
+USER_SECTION_TEMPLATE = "\n## @{user} 的帖子 ({total} 条)\n---\n"
+POST_SEPARATOR = "\n\n---\n\n"
+POST_ERROR_TEMPLATE = "\n### 帖子 {i}\n\n> ⚠️ 无法获取帖子内容\n\n- URL: {url}\n\n---\n\n"
+
+
 class ResultFileManager:
     """结果文件管理"""
 
+    MD_WRITE_BUFFER = 65536  # Markdown 写入缓冲，攒满 64KB 再落盘
+    PROGRESS_LOG_INTERVAL = 0.5  # 内容获取进度日志的输出间隔（秒）
+
     def __init__(self, config: Config, logger: Logger):
         self.config = config
         self.logger = logger
         self.config.results_dir.mkdir(parents=True, exist_ok=True)
 
+    @staticmethod
+    def _render_post(info: Dict, markdown: Optional[str]) -> str:
+        """单条帖子的 Markdown 段落（用户的第一条帖子前带用户标题）"""
+        section = USER_SECTION_TEMPLATE.format(user=info['user'], total=info['total']) if info['index'] == 1 else ""
+        if markdown:
+            return section + markdown + POST_SEPARATOR
+        return section + POST_ERROR_TEMPLATE.format(i=info['index'], url=info['url'])
+
     def _get_filename(self, timestamp: datetime) -> tuple[Path, Path]:
         """生成文件名"""
         basename = f"posts_{timestamp.strftime('%Y%m%d_%H%M%S')}"
@@ -909,38 +1267,41 @@ class ResultFileManager:
             self.config.results_dir / f"{basename}.md"
         )
 
-    def create_txt(self, timestamp: datetime, users: List[str]) -> Path:
-        """创建 TXT 文件"""
+    def create_txt(self, timestamp: datetime, users: List[str]) -> tuple[Path, int]:
+        """创建 TXT 文件（返回路径和保持打开的 O_APPEND 文件描述符，供整个抓取过程追加写入）"""
         filepath, _ = self._get_filename(timestamp)
 
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(f"# Crawl Results - {timestamp.strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"# Total users: {len(users)}\n")
-            f.write(f"# Started at: {timestamp.strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+        started_at = timestamp.strftime('%Y-%m-%d %H:%M:%S')
+        fd = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_APPEND, 0o644)
+        os.write(fd, (
+            f"# Crawl Results - {started_at}\n"
+            f"# Total users: {len(users)}\n"
+            f"# Started at: {started_at}\n\n"
+        ).encode("utf-8"))
 
         self.logger.info(f"Created TXT file: {filepath}")
-        return filepath
+        return filepath, fd
 
-    def append_user_results(self, filepath: Path, username: str, urls: List[str],
+    def append_user_results(self, fd: int, username: str, urls: List[str],
                           current: int, total: int) -> None:
-        """追加用户结果到 TXT 文件"""
-        with open(filepath, "a", encoding="utf-8") as f:
-            f.write(f"# @{username} ({len(urls)} posts) - [{current}/{total}]\n")
-            for url in urls:
-                f.write(f"{url}\n")
-            f.write("\n")
-            f.flush()
-
-    def finalize_txt(self, filepath: Path, total_posts: int) -> None:
-        """完成 TXT 文件"""
-        with open(filepath, "a", encoding="utf-8") as f:
-            f.write(f"\n# Completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"# Total posts: {total_posts}\n")
-            f.flush()
+        """追加用户结果到 TXT 文件（整条记录编码后一次 os.write，O_APPEND 保证追加的原子性）"""
+        url_lines = "".join(f"{url}\n" for url in urls)
+        os.write(fd, f"# @{username} ({len(urls)} posts) - [{current}/{total}]\n{url_lines}\n".encode("utf-8"))
+
+    def finalize_txt(self, fd: int, total_posts: int) -> None:
+        """完成 TXT 文件并关闭文件描述符"""
+        os.write(fd, (
+            f"\n# Completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+            f"# Total posts: {total_posts}\n"
+        ).encode("utf-8"))
+        os.close(fd)
 
     def save_markdown(self, results: Dict[str, List[str]], timestamp: datetime,
-                      api_client: TwitterApiClient, formatter: PostFormatter) -> Path:
-        """生成 Markdown 文件（并发获取内容）"""
+                      content_futures: Dict[str, List[Future]], total_posts: int) -> Path:
+        """生成 Markdown 文件（内容已在抓取过程中提交获取，按原顺序边完成边写入）
+
+        content_futures[user] 与 results[user] 一一对应，每个 future 返回该帖子的 Markdown（失败为 None）
+        """
         _, md_filepath = self._get_filename(timestamp)
 
         # 准备标题
@@ -948,73 +1309,59 @@ class ResultFileManager:
             "# X 帖子抓取结果",
             f"\n**抓取时间:** {timestamp.strftime('%Y-%m-%d %H:%M:%S')}",
             f"**总用户数:** {len(results)}",
-            f"**总帖子数:** {sum(len(urls) for urls in results.values())}",
+            f"**总帖子数:** {total_posts}",
             "\n---\n"
         ]
 
-        # 收集所有帖子信息
-        post_infos = []
-        content = list(header)
-
+        # 按输出顺序收集所有帖子信息及其 future（总数已知，列表一次分配好再按位置填充）
+        post_infos: List[Optional[Dict]] = [None] * total_posts
+        futures = {}
+        pos = 0
         for user, urls in results.items():
-            if not urls:
-                continue
-
-            content.extend([f"\n## @{user} 的帖子 ({len(urls)} 条)\n", "---\n"])
-
-            for i, url in enumerate(urls, 1):
-                section_start = len(content)
-                post_infos.append({'user': user, 'url': url, 'index': i, 'total': len(urls), 'section_start': section_start})
+            user_total = len(urls)
+            for i, (url, future) in enumerate(zip(urls, content_futures.get(user, [])), 1):
+                futures[future] = pos
+                post_infos[pos] = {'user': user, 'url': url, 'index': i, 'total': user_total}
+                pos += 1
 
-                # 占位符
-                content.extend([
-                    f"\n### 帖子 {i}\n\n",
-                    "> 正在获取内容...\n\n",
-                    f"- URL: {url}\n\n",
-                    "---\n\n"
-                ])
+        self.logger.info(f"Writing markdown for {len(futures)} posts...")
 
-        # 并发获取内容
-        from concurrent.futures import ThreadPoolExecutor, as_completed
+        with open(md_filepath, "w", encoding="utf-8", buffering=self.MD_WRITE_BUFFER) as f:
+            f.write("".join(header))
 
-        self.logger.info(f"Fetching content for {len(post_infos)} posts concurrently...")
+            # 已完成但前面还有未完成帖子的段落，按位置暂存；next_to_flush 之前的已写入文件
+            pending: Dict[int, str] = {}
+            next_to_flush = 0
 
-        def fetch_content(info):
-            post_data = api_client.fetch_post(info['url'])
-            if post_data:
-                return info, formatter.format_as_markdown(
-                    post_data['data'],
-                    post_data['source'],
-                    info['url']
-                )
-            return info, None
-
-        with ThreadPoolExecutor(max_workers=self.config.content_fetch_workers) as executor:
-            futures = {executor.submit(fetch_content, info): info for info in post_infos}
+            # 进度日志限频：每 PROGRESS_LOG_INTERVAL 秒输出一行汇总
+            fetched = 0
+            last_progress_log = time.monotonic()
 
             completed = 0
             for future in as_completed(futures):
                 completed += 1
-                info = futures[future]
+                pos = futures.pop(future)
+                info = post_infos[pos]
 
+                markdown = None
                 try:
-                    _, markdown = future.result()
+                    markdown = future.result()
                     if markdown:
-                        content[info['section_start']] = markdown + "\n\n---\n\n"
-                        self.logger.info(f"Fetched {info['user']} post {info['index']}/{info['total']} [{completed}/{len(post_infos)}]")
-                    else:
-                        content[info['section_start']] = (
-                            f"\n### 帖子 {info['index']}\n\n"
-                            "> ⚠️ 无法获取帖子内容\n\n"
-                            f"- URL: {info['url']}\n\n"
-                            "---\n\n"
-                        )
+                        fetched += 1
                 except Exception as e:
                     self.logger.error(f"Error fetching {info['url']}: {str(e)}")
 
-        # 保存
-        with open(md_filepath, "w", encoding="utf-8") as f:
-            f.write("".join(content))
+                pending[pos] = self._render_post(info, markdown)
+                while next_to_flush in pending:
+                    f.write(pending.pop(next_to_flush))
+                    next_to_flush += 1
+
+                now = time.monotonic()
+                if now - last_progress_log >= self.PROGRESS_LOG_INTERVAL:
+                    self.logger.info(f"Fetched {fetched}/{total_posts} posts [{completed}/{total_posts} done]")
+                    last_progress_log = now
+
+            self.logger.info(f"Fetched {fetched}/{total_posts} posts [{completed}/{total_posts} done]")
 
         self.logger.info(f"Markdown saved to {md_filepath}")
         return md_filepath
@@ -1032,7 +1379,7 @@ class CrawlHot:
         self.config = Config()
         self.logger = Logger(self.config.log_file)
 
-        # 进程锁
+        # 进程锁（fd 在整个进程期间保持打开，由 main() 的 finally 释放；进程异常退出时内核自动解锁）
         self.lock = ProcessLock(self.config.base_dir / ".craw_hot.lock")
         if not self.lock.acquire():
             print(f"❌ Error: Another craw-hot instance is already running!")
@@ -1046,84 +1393,84 @@ class CrawlHot:
         self.formatter = PostFormatter(self.config, self.logger)
         self.user_manager = UserManager(self.config, self.logger)
         self.result_manager = ResultFileManager(self.config, self.logger)
+        self.crawler = PostCrawler(self.config, self.logger, self.browser)  # 无每用户状态，可复用
 
         # 浏览器操作锁（用于并发抓取）
         self.browser_lock = threading.Lock()
 
+        # 执行带超时的单用户抓取
+        self._timeout_executor = ThreadPoolExecutor(max_workers=self.config.user_crawl_workers)
+
         self.logger.info("=" * 60)
         self.logger.info("CrawlHot initialized")
 
-    def __del__(self):
-        """析构函数"""
-        if hasattr(self, 'lock'):
-            self.lock.release()
-
-    def _retry_with_timeout(self, func: Callable, username: str, timeout: int) -> List[str]:
-        """带超时和重试的执行器"""
-        import threading
+    def close(self) -> None:
+        """关闭超时执行器并释放进程锁（由 main() 的 finally 调用）"""
+        self._timeout_executor.shutdown(wait=False, cancel_futures=True)
+        self.lock.release()
 
-        result = []
-        exception = [None]
-
-        def _worker():
-            try:
-                result.extend(func())
-            except NoPostsFoundError:
-                pass  # 正常情况，不记录
-            except Exception as e:
-                exception[0] = e
-
-        def _timeout_handler():
-            exception[0] = CrawlTimeoutError(f"Crawl for @{username} timed out after {timeout}s")
-
-        thread = threading.Thread(target=_worker)
-        timer = threading.Timer(timeout, _timeout_handler)
+    def _retry_with_timeout(self, func: Callable[[threading.Event], List[str]], username: str, timeout: int) -> List[str]:
+        """带超时的执行器
 
+        超时后设置取消标志并等待工作线程在下一个检查点退出，
+        保证调用方释放 browser_lock 时不再有线程操作浏览器；返回空列表
+        """
+        cancel = threading.Event()
+        future = self._timeout_executor.submit(func, cancel)
         try:
-            thread.start()
-            timer.start()
-            thread.join(timeout=timeout + 5)
-            timer.cancel()
-
-            if exception[0]:
-                self.logger.error(f"Exception: {str(exception[0])}")
-                return []
-
-            return result
+            return future.result(timeout=timeout)
+        except NoPostsFoundError:
+            return []  # 正常情况，不记录
+        except FuturesTimeoutError:
+            self.logger.error(f"Crawl for @{username} timed out after {timeout}s, cancelling")
+            cancel.set()
+            wait([future])
+            return []
         except Exception as e:
-            self.logger.error(f"Unexpected error: {str(e)}")
+            self.logger.error(f"Exception: {str(e)}")
             return []
 
     def crawl_single_user(self, username: str) -> List[str]:
         """抓取单个用户（带浏览器锁保护）"""
         with self.browser_lock:
             return self._retry_with_timeout(
-                lambda: self._retry_crawl_user(username),
+                lambda cancel: self._retry_crawl_user(username, cancel),
                 username=username,
                 timeout=self.config.user_crawl_timeout
             )
 
-    def _retry_crawl_user(self, username: str) -> List[str]:
-        """带重试的抓取"""
+    def _retry_crawl_user(self, username: str, cancel: Optional[threading.Event] = None) -> List[str]:
+        """带重试的抓取（cancel 被设置后不再重试）"""
         for attempt in range(1, self.config.max_retries + 1):
             try:
                 self.logger.debug(f"Attempt {attempt}/{self.config.max_retries}")
-                crawler = PostCrawler(self.config, self.logger, self.browser)
-                return crawler.crawl_user(username)
+                return self.crawler.crawl_user(username, cancel)
             except NoPostsFoundError:
                 self.logger.info(f"@{username}: no posts found in the last 24 hours")
                 return []
+            except CrawlTimeoutError:
+                raise
             except Exception as e:
                 self.logger.error(f"Attempt {attempt} failed: {str(e)}")
 
                 if attempt < self.config.max_retries:
                     wait_time = random.uniform(1, 3) * attempt
                     self.logger.warning(f"Retrying in {wait_time:.2f}s...")
-                    time.sleep(wait_time)
+                    if cancel is None:
+                        time.sleep(wait_time)
+                    elif cancel.wait(wait_time):
+                        raise CrawlTimeoutError(f"Crawl for @{username} cancelled after timeout")
 
         self.logger.error(f"All attempts failed for @{username}")
         return []
 
+    def _fetch_markdown(self, url: str) -> Optional[str]:
+        """获取单条帖子并格式化为 Markdown（获取与格式化在同一工作线程内完成），失败返回 None"""
+        post_data = self.api_client.fetch_post(url)
+        if post_data:
+            return self.formatter.format_as_markdown(post_data['data'], post_data['source'], url)
+        return None
+
     def crawl_all_users(self) -> Dict[str, List[str]]:
         """抓取所有用户（并发模式）"""
         users = self.user_manager.load()
@@ -1135,68 +1482,85 @@ class CrawlHot:
         all_results = {}
 
         # 创建结果文件
-        txt_filepath = self.result_manager.create_txt(timestamp, users)
+        _, txt_fd = self.result_manager.create_txt(timestamp, users)
 
         # 并发抓取
         self.logger.info(f"Starting crawl (concurrent mode, {self.config.user_crawl_workers} workers)...")
 
-        completed_count = 0
-        with ThreadPoolExecutor(max_workers=self.config.user_crawl_workers) as executor:
-            # 提交所有用户的抓取任务
-            future_to_user = {
-                executor.submit(self.crawl_single_user, user): user
-                for user in users
-            }
-
-            # 按完成顺序处理结果
-            for future in as_completed(future_to_user):
-                user = future_to_user[future]
-                completed_count += 1
-
-                try:
-                    urls = future.result()
-                    all_results[user] = urls
-
-                    # 立即保存
-                    self.result_manager.append_user_results(txt_filepath, user, urls, completed_count, len(users))
+        # 帖子内容获取与用户抓取流水线并行：每个用户抓完立即提交其帖子的内容获取
+        content_futures: Dict[str, List[Future]] = {}
 
-                    if urls:
-                        self.logger.info(f"@{user}: {len(urls)} posts [{completed_count}/{len(users)}]")
-                    else:
-                        self.logger.warning(f"@{user}: no posts found [{completed_count}/{len(users)}]")
-                except Exception as e:
-                    self.logger.error(f"Failed to crawl @{user}: {str(e)}")
-                    all_results[user] = []
-
-                    # 即使失败也追加空结果
-                    self.result_manager.append_user_results(txt_filepath, user, [], completed_count, len(users))
-
-        # 完成 TXT 文件
-        total_posts = sum(len(urls) for urls in all_results.values())
-        self.result_manager.finalize_txt(txt_filepath, total_posts)
-
-        # 生成 Markdown 文件
-        self.result_manager.save_markdown(
-            all_results,
-            timestamp,
-            self.api_client,
-            self.formatter
-        )
+        # 摘要统计随结果处理累计，无需事后再遍历一遍
+        total_posts = 0
+        summary_lines: List[str] = []
 
-        self._print_summary(all_results)
+        completed_count = 0
+        with ThreadPoolExecutor(max_workers=self.config.content_fetch_workers) as content_executor:
+            with ThreadPoolExecutor(max_workers=self.config.user_crawl_workers) as executor:
+                # 有界提交：同时在途的任务最多 2 × 并发数，完成一个再补一个
+                max_in_flight = self.config.user_crawl_workers * 2
+                pending_users = iter(users)
+                in_flight = set()
+
+                def submit_more():
+                    for user in itertools.islice(pending_users, max_in_flight - len(in_flight)):
+                        future = executor.submit(self.crawl_single_user, user)
+                        future._user = user  # 直接挂在 future 上，省去反查用的字典
+                        in_flight.add(future)
+
+                submit_more()
+
+                # 按完成顺序处理结果
+                while in_flight:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    in_flight -= done
+                    for future in done:
+                        user = future._user
+                        completed_count += 1
+
+                        try:
+                            urls = future.result()
+                            all_results[user] = urls
+                            total_posts += len(urls)
+                            summary_lines.append(f"@{user}: {len(urls)} posts")
+                            content_futures[user] = [content_executor.submit(self._fetch_markdown, url) for url in urls]
+
+                            # 立即保存
+                            self.result_manager.append_user_results(txt_fd, user, urls, completed_count, len(users))
+
+                            if urls:
+                                self.logger.info(f"@{user}: {len(urls)} posts [{completed_count}/{len(users)}]")
+                            else:
+                                self.logger.warning(f"@{user}: no posts found [{completed_count}/{len(users)}]")
+                        except Exception as e:
+                            self.logger.error(f"Failed to crawl @{user}: {str(e)}")
+                            all_results[user] = []
+                            summary_lines.append(f"@{user}: 0 posts")
+
+                            # 即使失败也追加空结果
+                            self.result_manager.append_user_results(txt_fd, user, [], completed_count, len(users))
+
+                    submit_more()
+
+            # 完成 TXT 文件（总帖子数在处理结果时累计，TXT、Markdown 和摘要共用）
+            self.result_manager.finalize_txt(txt_fd, total_posts)
+
+            # 生成 Markdown 文件（此时大部分内容已获取完成）
+            self.result_manager.save_markdown(all_results, timestamp, content_futures, total_posts)
+
+        self._print_summary(summary_lines, total_posts)
         return all_results
 
-    def _print_summary(self, results: Dict[str, List[str]]) -> None:
-        """打印摘要"""
-        total_posts = sum(len(urls) for urls in results.values())
+    def _print_summary(self, summary_lines: List[str], total_posts: int) -> None:
+        """打印摘要（每个用户一行，已在处理结果时生成）"""
         self.logger.info("=" * 60)
         self.logger.info("CRAWL SUMMARY")
         self.logger.info("=" * 60)
-        self.logger.info(f"Total users: {len(results)}")
+        self.logger.info(f"Total users: {len(summary_lines)}")
         self.logger.info(f"Total posts: {total_posts}")
         self.logger.info("")
-        for user, urls in results.items():
-            self.logger.info(f"@{user}: {len(urls)} posts")
+        for line in summary_lines:
+            self.logger.info(line)
         self.logger.info("=" * 60)
 
 
@@ -1257,7 +1621,7 @@ def main():
 
     finally:
         if crawler:
-            crawler.lock.release()
+            crawler.close()
 
 
 if __name__ == "__main__":